@@ -0,0 +1,28 @@
+import os
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:5001")
+
+# gevent by default, GUNICORN_WORKER_CLASS=gthread for plain threads. psycopg 3
+# notices gevent's monkey patching on its own and waits cooperatively
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gevent")
+# each worker has its own pool, so workers * (SQLALCHEMY_POOL_SIZE + SQLALCHEMY_MAX_OVERFLOW)
+# has to stay under postgres' max_connections (100 by default)
+workers = int(os.environ.get("GUNICORN_WORKERS", 2))
+# a gevent worker only has pool_size + max_overflow connections, any greenlets beyond that
+# wait for one and fail with a QueuePool timeout after SQLALCHEMY_POOL_TIMEOUT. raise this
+# only if many requests don't touch the db
+worker_connections = int(
+    os.environ.get(
+        "GUNICORN_WORKER_CONNECTIONS",
+        int(os.environ.get("SQLALCHEMY_POOL_SIZE", 20)) + int(os.environ.get("SQLALCHEMY_MAX_OVERFLOW", 20)),
+    )
+)
+threads = int(os.environ.get("GUNICORN_THREADS", 16))
+
+
+def post_worker_init(worker):
+    from webserver import db
+
+    # the app is loaded at this point, open this worker's pool before taking requests
+    if db.engine is not None:
+        db.warm_pool()
\ No newline at end of file
@@ -1,7 +1,9 @@
+import os
+
 import click
 from werkzeug.serving import run_simple
 
-from webserver import create_app
+from webserver import create_app, db
 
 cli = click.Group()
 application = create_app()
@@ -12,6 +14,9 @@ application = create_app()
 @click.option("--port", "-p", default=5001, show_default=True)
 @click.option("--debug", "-d", is_flag=True, help="debugger blah blah")
 def runserver(host, port, debug=False):
+    # with the reloader on, only the child process actually serves requests
+    if not debug or os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        db.warm_pool()
     run_simple(
         hostname=host,
         port=port,
@@ -21,5 +26,13 @@ def runserver(host, port, debug=False):
         threaded=True,
     )
 
+
+@cli.command()
+def initdb():
+    # creates the database on a fresh cluster and applies the schema migrations,
+    # run it once before starting the server processes
+    db.initalize_databse_if_it_dont_exist(application)
+
+
 if __name__ == "__main__":
     cli()
\ No newline at end of file
@@ -1,17 +1,19 @@
-CREATE TABLE users (
+CREATE EXTENSION IF NOT EXISTS citext;
+
+CREATE TABLE IF NOT EXISTS users (
     id SERIAL PRIMARY KEY,
     user_name VARCHAR(100),
     password_hash TEXT NOT NULL,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-    email_id VARCHAR(100) NOT NULL,
+    email_id CITEXT NOT NULL UNIQUE,
     face_auth VARCHAR,
-    public_id VARCHAR NOT NULL
+    public_id UUID NOT NULL
 );
 
-CREATE TABLE s3_metadata(
+CREATE TABLE IF NOT EXISTS s3_metadata(
     id SERIAL PRIMARY KEY,
-    email_id VARCHAR(100) REFERENCES users(email_id),
+    email_id CITEXT,
     file_path VARCHAR,
-    file_size INT,
+    file_size BIGINT,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
\ No newline at end of file
@@ -0,0 +1,81 @@
+-- runs on every boot after create_table.sql, keep everything idempotent
+
+-- emails were never enforced unique before, and citext also treats case variants as
+-- equal. stop with a readable message instead of failing on the UNIQUE/CITEXT steps
+DO $$
+DECLARE
+    collisions TEXT;
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint WHERE conrelid = 'users'::regclass AND conname = 'users_email_id_key'
+    ) OR (SELECT atttypid::regtype::text FROM pg_attribute WHERE attrelid = 'users'::regclass AND attname = 'email_id') <> 'citext'
+    THEN
+        SELECT string_agg(emails, '; ') INTO collisions FROM (
+            SELECT string_agg(email_id::text, ', ' ORDER BY id) AS emails
+            FROM users GROUP BY lower(email_id::text) HAVING count(*) > 1
+        ) AS dupes;
+
+        IF collisions IS NOT NULL THEN
+            RAISE EXCEPTION USING MESSAGE =
+                'users.email_id has case-insensitive duplicates, merge or delete them and rerun initdb: ' || collisions;
+        END IF;
+    END IF;
+END
+$$;
+
+-- email_id used to be VARCHAR, the foreign key is dropped while both sides change
+-- type and put back further down
+DO $$
+BEGIN
+    IF (SELECT atttypid::regtype::text FROM pg_attribute WHERE attrelid = 'users'::regclass AND attname = 'email_id') <> 'citext'
+        OR (SELECT atttypid::regtype::text FROM pg_attribute WHERE attrelid = 's3_metadata'::regclass AND attname = 'email_id') <> 'citext'
+    THEN
+        ALTER TABLE s3_metadata DROP CONSTRAINT IF EXISTS s3_metadata_email_id_fkey;
+        ALTER TABLE users ALTER COLUMN email_id TYPE CITEXT;
+        ALTER TABLE s3_metadata ALTER COLUMN email_id TYPE CITEXT;
+    END IF;
+END
+$$;
+
+-- public_id used to be VARCHAR holding uuid4 strings
+DO $$
+BEGIN
+    IF (SELECT atttypid::regtype::text FROM pg_attribute WHERE attrelid = 'users'::regclass AND attname = 'public_id') <> 'uuid' THEN
+        ALTER TABLE users ALTER COLUMN public_id TYPE UUID USING public_id::uuid;
+    END IF;
+END
+$$;
+
+-- file_size used to be INT, which tops out at 2GB
+DO $$
+BEGIN
+    IF (SELECT atttypid::regtype::text FROM pg_attribute WHERE attrelid = 's3_metadata'::regclass AND attname = 'file_size') <> 'bigint' THEN
+        ALTER TABLE s3_metadata ALTER COLUMN file_size TYPE BIGINT;
+    END IF;
+END
+$$;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint WHERE conrelid = 'users'::regclass AND conname = 'users_email_id_key'
+    ) THEN
+        ALTER TABLE users ADD CONSTRAINT users_email_id_key UNIQUE (email_id);
+    END IF;
+END
+$$;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint WHERE conrelid = 's3_metadata'::regclass AND conname = 's3_metadata_email_id_fkey'
+    ) THEN
+        ALTER TABLE s3_metadata ADD CONSTRAINT s3_metadata_email_id_fkey FOREIGN KEY (email_id) REFERENCES users(email_id);
+    END IF;
+END
+$$;
+
+CREATE INDEX IF NOT EXISTS ix_s3_metadata_email ON s3_metadata(email_id);
+CREATE INDEX IF NOT EXISTS ix_users_user_name ON users(user_name);
+CREATE INDEX IF NOT EXISTS ix_users_email_cover ON users(email_id) INCLUDE (password_hash, public_id);
+CREATE INDEX IF NOT EXISTS ix_users_public_id_cover ON users(public_id) INCLUDE (email_id);
\ No newline at end of file
@@ -0,0 +1,50 @@
+from unittest import mock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from webserver.db import storage, user
+
+QUERIES = {
+    f"{module.__name__}.{name}": query
+    for module in (user, storage)
+    for name, query in vars(module).items()
+    if name.startswith("QRY_")
+}
+
+# every db helper with arguments to call it with, the conn is a mock that records
+# which query it got and the params dict(s) passed along
+HELPER_CALLS = {
+    "check_if_user_name_is_unique": (user.check_if_user_name_is_unique, ("u",)),
+    "register_user": (user.register_user, ("u", "a@b.c", "hash", "0b0e2f9e-7c43-4a8a-9d51-2c5e1a7f3b10")),
+    "update_password_hash": (user.update_password_hash, ("a@b.c", "hash")),
+    "get_user": (user.get_user, ("a@b.c",)),
+    "get_user_by_public_id": (user.get_user_by_public_id, ("0b0e2f9e-7c43-4a8a-9d51-2c5e1a7f3b10",)),
+    "insert_s3_metadata": (storage.insert_s3_metadata, ("a@b.c", "f", 1)),
+    "insert_s3_metadata_bulk": (storage.insert_s3_metadata_bulk, ("a@b.c", [("f", 1), ("g", 2)])),
+    "get_total_size_for_user": (storage.get_total_size_for_user, ("a@b.c",)),
+}
+
+
+def _execute_calls(helper, args):
+    conn = mock.MagicMock()
+    helper(*args, conn=conn)
+    return [call.args for call in conn.execute.call_args_list]
+
+
+@pytest.mark.parametrize("name", sorted(HELPER_CALLS))
+def test_helper_params_match_query_binds(name):
+    helper, args = HELPER_CALLS[name]
+    calls = _execute_calls(helper, args)
+    assert calls
+
+    for query, params in calls:
+        binds = set(query.compile(dialect=postgresql.dialect()).params)
+        for row in params if isinstance(params, list) else [params]:
+            assert set(row) == binds
+
+
+def test_every_query_is_used_by_a_helper():
+    used = {id(query) for helper, args in HELPER_CALLS.values() for query, _ in _execute_calls(helper, args)}
+    unused = [name for name, query in QUERIES.items() if id(query) not in used]
+    assert not unused
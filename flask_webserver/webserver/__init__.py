@@ -1,14 +1,25 @@
+import hashlib
+import hmac
+import os
+import re
 from flask import Flask
 from logging.config import dictConfig
 from flask_jwt_extended import JWTManager
 
-def create_app():
+# read .env once per process, production gets its env from the process manager
+if os.environ.get("FLASK_ENV") != "production":
     from dotenv import load_dotenv
-    load_dotenv()  
+    load_dotenv()
 
+def create_app():
     app = Flask(__name__)
     app.config.from_pyfile("config.py", silent=True)
 
+    # keyed once here so token_required only has to copy it per request
+    secret_bytes = app.config["SECRET_KEY"].encode()
+    app.extensions["_jwt_secret_bytes"] = secret_bytes
+    app.extensions["_jwt_hmac_ctor"] = hmac.new(secret_bytes, digestmod=hashlib.sha256).copy
+
     dictConfig(
         {
             "version": 1,
@@ -28,25 +39,42 @@ def create_app():
         }
     )
 
+    # database bootstrap + migrations run once per deploy via `manage.py initdb`
     from webserver import db
 
-    db.initalize_databse_if_it_dont_exist(app)
-    db.init_db_engine(app.config["SQLALCHEMY_URI"])
+    db.init_db_engine(
+        app.config["SQLALCHEMY_URI"],
+        pool_size=app.config["SQLALCHEMY_POOL_SIZE"],
+        max_overflow=app.config["SQLALCHEMY_MAX_OVERFLOW"],
+        pool_timeout=app.config["SQLALCHEMY_POOL_TIMEOUT"],
+        pool_recycle=app.config["SQLALCHEMY_POOL_RECYCLE"],
+        pool_pre_ping=app.config["SQLALCHEMY_POOL_PRE_PING"],
+        query_cache_size=app.config["SQLALCHEMY_QUERY_CACHE_SIZE"],
+    )
+    app.after_request(db.commit_request_conn)
+    app.teardown_request(db.close_request_conn)
 
-    from webserver.views import auth
+    from webserver.views import auth, metadata
     app.register_blueprint(auth.auth_bp)
+    app.register_blueprint(metadata.metadata_bp)
     app.add_url_rule("/", endpoint="index")
 
     jwt = JWTManager(app)
-    from flask_cors import CORS
-
-    CORS(
-        app,
-        supports_credentials=True,
-        origins=[
-            "http://localhost:3000",  # react native dev
-        ]
-    )
+
+    if app.config.get("ENABLE_CORS", True):
+        from flask_cors import CORS
+
+        # origins and credentials come from the CORS_* config keys. only the api
+        # blueprints' routes get cors handling, everything else skips it
+        api_blueprints = (auth.auth_bp.name, metadata.metadata_bp.name)
+        CORS(
+            app,
+            resources=[
+                f"^{re.escape(rule.rule)}$"
+                for rule in app.url_map.iter_rules()
+                if rule.endpoint.split(".")[0] in api_blueprints
+            ],
+        )
 
 
     return app
\ No newline at end of file
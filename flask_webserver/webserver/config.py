@@ -1,8 +1,20 @@
+import os
 from datetime import timedelta
 
 SECRET_KEY="DONT_CHANGE_THIS_EVER"
-SQLALCHEMY_URI = "postgresql://webapp:webapp@pg_db:5432/webapp"
-POSTGRES_ADMIN_URI = "postgresql://postgres:postgres@pg_db:5432/postgres"
+SQLALCHEMY_URI = "postgresql+psycopg://webapp:webapp@pg_db:5432/webapp"
+POSTGRES_ADMIN_URI = "postgresql+psycopg://postgres:postgres@pg_db:5432/postgres"
+
+SQLALCHEMY_POOL_SIZE = int(os.environ.get("SQLALCHEMY_POOL_SIZE", 20))
+SQLALCHEMY_MAX_OVERFLOW = int(os.environ.get("SQLALCHEMY_MAX_OVERFLOW", 20))
+SQLALCHEMY_POOL_TIMEOUT = int(os.environ.get("SQLALCHEMY_POOL_TIMEOUT", 30))
+SQLALCHEMY_POOL_RECYCLE = int(os.environ.get("SQLALCHEMY_POOL_RECYCLE", 3600))
+SQLALCHEMY_POOL_PRE_PING = os.environ.get("SQLALCHEMY_POOL_PRE_PING", "1") == "1"
+SQLALCHEMY_QUERY_CACHE_SIZE = int(os.environ.get("SQLALCHEMY_QUERY_CACHE_SIZE", 500))
+
+# upper bound on rows a single /insert-metadata-batch call may insert
+METADATA_BATCH_MAX_ROWS = int(os.environ.get("METADATA_BATCH_MAX_ROWS", 1000))
+
 JWT_SECRET_KEY = "dev-secret"
 JWT_ACCESS_TOKEN_EXPIRES = timedelta(minutes=15)
 JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=7)
@@ -12,4 +24,9 @@ JWT_REFRESH_COOKIE_NAME = "refresh_token"
 
 JWT_COOKIE_SECURE = False
 JWT_COOKIE_SAMESITE = "Lax"
-JWT_COOKIE_CSRF_PROTECT = False
\ No newline at end of file
+JWT_COOKIE_CSRF_PROTECT = False
+
+# set ENABLE_CORS=0 when the reverse proxy adds the Access-Control-* headers itself
+ENABLE_CORS = os.environ.get("ENABLE_CORS", "1") == "1"
+CORS_ORIGINS = ["http://localhost:3000"]  # react native dev
+CORS_SUPPORTS_CREDENTIALS = True
\ No newline at end of file
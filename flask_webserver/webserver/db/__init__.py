@@ -1,24 +1,95 @@
 import os
+from flask import g
 from sqlalchemy import create_engine, text
 
 SQL_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "..", "postgre-sql")
 
 engine = None
 
+# libpq tcp keepalives so dead sockets behind NAT/k8s get noticed, and let psycopg
+# server-side prepare any statement that has run 5 times on a connection
+CONNECT_ARGS = {
+    "keepalives": 1,
+    "keepalives_idle": 30,
+    "keepalives_interval": 10,
+    "keepalives_count": 3,
+    "prepare_threshold": 5,
+}
 
-def init_db_engine(connect_str):
+
+def init_db_engine(
+    connect_str,
+    pool_size=20,
+    max_overflow=20,
+    pool_timeout=30,
+    pool_recycle=3600,
+    pool_pre_ping=True,
+    query_cache_size=500,
+):
     global engine
-    engine = create_engine(connect_str)
+    engine = create_engine(
+        connect_str,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=pool_timeout,
+        pool_recycle=pool_recycle,
+        pool_pre_ping=pool_pre_ping,
+        query_cache_size=query_cache_size,
+        connect_args=CONNECT_ARGS,
+    )
+
+
+def warm_pool(size=None):
+    # check out several connections at once so the pool really opens that many,
+    # connect().close() in a loop would just keep reusing the first one
+    size = size or engine.pool.size()
+    conns = [engine.connect() for _ in range(size)]
+    for conn in conns:
+        conn.close()
+
+
+def get_conn():
+    # one pooled connection per request, checked out on first use
+    if "db_conn" not in g:
+        g.db_conn = engine.connect()
+    return g.db_conn
+
+
+def commit_request_conn(response):
+    conn = g.get("db_conn")
+    if conn is not None:
+        if response.status_code < 400:
+            conn.commit()
+        else:
+            conn.rollback()
+    return response
+
+
+def close_request_conn(exc=None):
+    conn = g.pop("db_conn", None)
+    if conn is not None:
+        conn.close()
+
+
+def split_sql_script(script):
+    # split on ; except inside $$ ... $$ bodies, so DO blocks stay in one piece
+    commands = [""]
+    for i, part in enumerate(script.split("$$")):
+        if i % 2:
+            commands[-1] += "$$" + part + "$$"
+        else:
+            pieces = part.split(";")
+            commands[-1] += pieces[0]
+            commands.extend(pieces[1:])
+    return [command.strip() for command in commands if command.strip()]
 
 
 def exec_sql_script(sql_file_path):
     with open(sql_file_path) as sql:
-        commands = sql.read().split(";")
+        commands = split_sql_script(sql.read())
         with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
             for command in commands:
-                command.strip()
-                if command:
-                    conn.execute(text(command))
+                conn.execute(text(command))
 
 def new_database_needed() -> bool:
     with engine.connect() as conn:
@@ -37,8 +108,11 @@ def initalize_databse_if_it_dont_exist(app):
         app.logger.info("CREATING A NEW ONE")
         exec_sql_script(os.path.join(SQL_DIR, "create_db.sql"))
 
-        init_db_engine(app.config["SQLALCHEMY_URI"])
+    init_db_engine(app.config["SQLALCHEMY_URI"])
 
-        app.logger.info("CREATE TABLES")
-        exec_sql_script(os.path.join(SQL_DIR, "create_table.sql"))
-        app.logger.info("DONE")
\ No newline at end of file
+    # both scripts are idempotent, so existing databases pick up schema changes too
+    app.logger.info("CREATE TABLES")
+    exec_sql_script(os.path.join(SQL_DIR, "create_table.sql"))
+    app.logger.info("MIGRATE")
+    exec_sql_script(os.path.join(SQL_DIR, "migrate.sql"))
+    app.logger.info("DONE")
\ No newline at end of file
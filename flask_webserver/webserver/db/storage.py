@@ -2,18 +2,30 @@ from sqlalchemy import text
 
 from webserver import db
 
+QRY_INSERT_S3_METADATA = text(
+    "INSERT INTO s3_metadata (email_id, file_path, file_size) VALUES (:email_id, :file_path, :file_size)"
+)
+QRY_TOTAL_SIZE_FOR_USER = text(
+    "SELECT COALESCE(SUM(file_size), 0)::bigint AS total FROM s3_metadata WHERE email_id = :email_id"
+)
 
-def insert_s3_metadata(email_id: str, file_path: str, size: int):
-    query = "INSERT INTO BUCKET_INFO (email_id, file_path, size) VALUES (:email_id, :file_path, :size)"
-    with db.engine.begin() as conn:
-        conn.execute(text(query), {"email_id": email_id, "file_path": file_path, "size": size})
 
+def insert_s3_metadata(email_id: str, file_path: str, size: int, conn=None):
+    conn = conn or db.get_conn()
+    conn.execute(QRY_INSERT_S3_METADATA, {"email_id": email_id, "file_path": file_path, "file_size": size})
+
+
+def insert_s3_metadata_bulk(email_id: str, rows: list[tuple[str, int]], conn=None):
+    # a list of params makes this a cursor.executemany, psycopg 3 pipelines those so the
+    # whole batch costs about one round trip instead of one per row
+    conn = conn or db.get_conn()
+    params = [{"email_id": email_id, "file_path": file_path, "file_size": size} for file_path, size in rows]
+    if params:
+        conn.execute(QRY_INSERT_S3_METADATA, params)
+
+
+def get_total_size_for_user(email_id: str, conn=None) -> int:
+    conn = conn or db.get_conn()
+    res = conn.execute(QRY_TOTAL_SIZE_FOR_USER, {"email_id": email_id})
+    return res.scalar()
 
-def get_metadata_for_user(email_id: str) -> list[dict]:
-    query = "SELECT * FROM s3_metadata WHERE email_id = :email_id"
-    with db.engine.connect() as conn:
-        res = conn.execute(text(query), {"email_id": email_id})
-        return res.mappings().fetchall()
-    query = "INSERT INTO TABLE s3_metadata (email_id, file_path, file_size) VALUES (:email_id, :file_path, :file_size)"
-    with db.engine.begin() as conn:
-        conn.execute(text(query), {"email_id": email_id, "file_path": file_path, "file_size": size})
@@ -2,35 +2,45 @@ from sqlalchemy import text
 
 from webserver import db
 
+QRY_USER_NAME_EXISTS = text("SELECT EXISTS(SELECT 1 FROM users WHERE user_name = :user_name)")
+QRY_REGISTER_USER = text(
+    "INSERT INTO users (user_name, email_id, password_hash, public_id) "
+    "VALUES (:user_name, :email_id, :password_hash, :public_id) "
+    "ON CONFLICT (email_id) DO NOTHING RETURNING public_id"
+)
+QRY_UPDATE_PASSWORD_HASH = text("UPDATE users SET password_hash = :password_hash WHERE email_id = :email_id")
+QRY_GET_USER = text("SELECT password_hash, public_id FROM users WHERE email_id=:email_id")
+QRY_GET_USER_BY_PUBLIC_ID = text("SELECT email_id, public_id FROM users WHERE public_id = :public_id")
 
-def check_if_user_name_is_unique(user_name: str) -> bool:
-    query = 'SELECT user_name FROM "user" WHERE user_name = :user_name'
-    with db.engine.connect() as conn:
-        res = conn.execute(text(query), {"user_name": user_name})
-        if res.rowcount == 0:
-            return True
-        else:
-            return False
-
-
-def register_user(user_name: str, email_id: str, password_hash: str, public_id: str):
-    query = "INSERT INTO users (user_name, email_id, password_hash, public_id) VALUES (:user_name, :email_id, :password_hash, :public_id)"
-    with db.engine.begin() as conn:
-        conn.execute(
-            text(query),
-            {"user_name": user_name, "email_id": email_id, "password_hash": password_hash, "public_id": public_id},
-        )
-
-
-def get_user(email_id: str):
-    query = "SELECT * FROM users WHERE email_id=:email_id"
-    with db.engine.connect() as conn:
-        res = conn.execute(text(query), {"email_id": email_id})
-        return res.mappings().fetchone()
-
-
-def get_user_by_public_id(public_id: str):
-    query = "SELECT * FROM users WHERE public_id = :public_id"
-    with db.engine.connect() as conn:
-        res = conn.execute(text(query), {"public_id": public_id})
-        return res.mappings().fetchone()
\ No newline at end of file
+
+def check_if_user_name_is_unique(user_name: str, conn=None) -> bool:
+    conn = conn or db.get_conn()
+    res = conn.execute(QRY_USER_NAME_EXISTS, {"user_name": user_name})
+    return not res.scalar()
+
+
+def register_user(user_name: str, email_id: str, password_hash: str, public_id: str, conn=None):
+    """returns the new user's public_id, or None if the email is already taken"""
+    conn = conn or db.get_conn()
+    res = conn.execute(
+        QRY_REGISTER_USER,
+        {"user_name": user_name, "email_id": email_id, "password_hash": password_hash, "public_id": public_id},
+    )
+    return res.scalar()
+
+
+def update_password_hash(email_id: str, password_hash: str, conn=None):
+    conn = conn or db.get_conn()
+    conn.execute(QRY_UPDATE_PASSWORD_HASH, {"email_id": email_id, "password_hash": password_hash})
+
+
+def get_user(email_id: str, conn=None):
+    conn = conn or db.get_conn()
+    res = conn.execute(QRY_GET_USER, {"email_id": email_id})
+    return res.mappings().fetchone()
+
+
+def get_user_by_public_id(public_id: str, conn=None):
+    conn = conn or db.get_conn()
+    res = conn.execute(QRY_GET_USER_BY_PUBLIC_ID, {"public_id": public_id})
+    return res.mappings().fetchone()
\ No newline at end of file
@@ -1,7 +1,27 @@
+import hashlib
+import threading
+import time
 from functools import wraps
-from flask import request, current_app, jsonify
-import jwt
-from db import user as User
+from flask import request, current_app
+from cachetools import TTLCache
+from webserver.db import user as User
+from webserver.responses import ojsonify
+from webserver.tokens import decode_hs256
+
+# decoded payloads keyed by token hash, user rows keyed by public_id
+_tok_cache = TTLCache(maxsize=10000, ttl=30)
+_user_cache = TTLCache(maxsize=5000, ttl=60)
+_cache_lock = threading.Lock()
+
+
+def _token_key(token):
+    return hashlib.blake2b(token.encode(), digest_size=16).hexdigest()
+
+
+def invalidate_token(token):
+    if token:
+        with _cache_lock:
+            _tok_cache.pop(_token_key(token), None)
 
 
 def token_required(f):
@@ -10,13 +30,27 @@ def token_required(f):
         token = request.cookies.get("jwt_token")
 
         if not token:
-            return jsonify({"message": "Token is missing!"}), 401
+            return ojsonify({"message": "Token is missing!"}, 401)
 
         try:
-            data = jwt.decode(token, current_app.config["SECRET_KEY"], algorithms=["HS256"])
-            current_user = User.get_user_by_public_id(data["public_id"])
+            key = _token_key(token)
+            with _cache_lock:
+                data = _tok_cache.get(key)
+            if data is None or data.get("exp", float("inf")) <= time.time():
+                data = decode_hs256(token, current_app.extensions["_jwt_hmac_ctor"])
+                with _cache_lock:
+                    _tok_cache[key] = data
+
+            public_id = data["public_id"]
+            with _cache_lock:
+                current_user = _user_cache.get(public_id)
+            if current_user is None:
+                current_user = User.get_user_by_public_id(public_id)
+                if current_user is not None:
+                    with _cache_lock:
+                        _user_cache[public_id] = current_user
         except Exception as err:
-            return jsonify({"message": f"Token is invalid! {err}"}), 401
+            return ojsonify({"message": f"Token is invalid! {err}"}, 401)
 
         return f(current_user, *args, **kwargs)
 
@@ -0,0 +1,42 @@
+import hashlib
+import threading
+
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+from cachetools import TTLCache
+from werkzeug.security import check_password_hash
+
+_hasher = PasswordHasher(time_cost=2, memory_cost=19456, parallelism=1)
+
+# recent successful checks, so repeated logins from the same client skip the KDF
+_verified_cache = TTLCache(maxsize=10000, ttl=60)
+_cache_lock = threading.Lock()
+
+
+def hash_password(password: str) -> str:
+    return _hasher.hash(password)
+
+
+def check_password(email_id: str, stored_hash: str, password: str) -> bool:
+    key = (email_id, stored_hash, hashlib.sha256(password.encode()).digest())
+    with _cache_lock:
+        if key in _verified_cache:
+            return True
+
+    if stored_hash.startswith("$argon2"):
+        try:
+            ok = _hasher.verify(stored_hash, password)
+        except (VerificationError, InvalidHashError):
+            ok = False
+    else:
+        # werkzeug pbkdf2/scrypt hashes from before the switch to argon2id
+        ok = check_password_hash(stored_hash, password)
+
+    if ok:
+        with _cache_lock:
+            _verified_cache[key] = True
+    return ok
+
+
+def needs_rehash(stored_hash: str) -> bool:
+    return not stored_hash.startswith("$argon2") or _hasher.check_needs_rehash(stored_hash)
\ No newline at end of file
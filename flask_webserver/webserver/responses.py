@@ -0,0 +1,6 @@
+import orjson
+from flask import Response
+
+
+def ojsonify(obj, status=200):
+    return Response(orjson.dumps(obj), status=status, mimetype="application/json")
\ No newline at end of file
@@ -0,0 +1,59 @@
+import base64
+import hashlib
+import hmac
+import time
+import uuid
+
+import orjson
+from flask import current_app
+
+
+def _b64(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _unb64(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+# same bytes pyjwt emits for HS256, it never changes so encode it once
+HEADER_B64 = _b64(b'{"alg":"HS256","typ":"JWT"}')
+
+
+def fast_create_access_token(identity: str) -> str:
+    # same claims flask_jwt_extended's create_access_token builds for our config
+    # (no csrf/aud/iss), so its jwt_required() still verifies these
+    config = current_app.config
+    now = int(time.time())
+    claims = {
+        "fresh": False,
+        "iat": now,
+        "jti": str(uuid.uuid4()),
+        "type": "access",
+        config.get("JWT_IDENTITY_CLAIM", "sub"): identity,
+        "nbf": now,
+        "exp": now + int(config["JWT_ACCESS_TOKEN_EXPIRES"].total_seconds()),
+    }
+    signing_input = HEADER_B64 + b"." + _b64(orjson.dumps(claims))
+    signature = hmac.new(config["JWT_SECRET_KEY"].encode(), signing_input, hashlib.sha256).digest()
+    return (signing_input + b"." + _b64(signature)).decode()
+
+
+def decode_hs256(token: str, hmac_ctor) -> dict:
+    # hmac_ctor returns a fresh hmac already keyed with the secret
+    header_b64, payload_b64, signature_b64 = token.split(".")
+    if orjson.loads(_unb64(header_b64)).get("alg") != "HS256":
+        raise ValueError("The specified alg value is not allowed")
+
+    mac = hmac_ctor()
+    mac.update(f"{header_b64}.{payload_b64}".encode())
+    if not hmac.compare_digest(mac.digest(), _unb64(signature_b64)):
+        raise ValueError("Signature verification failed")
+
+    claims = orjson.loads(_unb64(payload_b64))
+    now = time.time()
+    if "exp" in claims and now >= claims["exp"]:
+        raise ValueError("Signature has expired")
+    if "nbf" in claims and now < claims["nbf"]:
+        raise ValueError("The token is not yet valid (nbf)")
+    return claims
\ No newline at end of file
@@ -1,13 +1,11 @@
 from flask import (
     Blueprint,
     request,
-    jsonify,
     url_for,
     render_template,
     redirect,
 )
 from flask_jwt_extended import (
-    create_access_token,
     create_refresh_token,
     set_refresh_cookies,
     jwt_required,
@@ -15,10 +13,13 @@ from flask_jwt_extended import (
     unset_jwt_cookies,
 )
 import uuid
-from werkzeug.security import generate_password_hash, check_password_hash
 
 from webserver.db import user as User
 from webserver.db import storage as Storage
+from webserver.responses import ojsonify
+from webserver.tokens import fast_create_access_token
+from webserver.decorators import invalidate_token
+from webserver.passwords import hash_password, check_password, needs_rehash
 
 auth_bp = Blueprint("auth", __name__)
 
@@ -35,12 +36,15 @@ def login():
         password = request.form["password"]
         user = User.get_user(email_id)
 
-        if not user or not check_password_hash(user["password_hash"], password):
-            return jsonify({"message": "Invalid email or password"}), 401
+        if not user or not check_password(email_id, user["password_hash"], password):
+            return ojsonify({"message": "Invalid email or password"}, 401)
 
-        access_token = create_access_token(identity=email_id)
+        if needs_rehash(user["password_hash"]):
+            User.update_password_hash(email_id, hash_password(password))
+
+        access_token = fast_create_access_token(email_id)
         refresh_token = create_refresh_token(identity=email_id)
-        response = jsonify({"access_token": access_token})
+        response = ojsonify({"access_token": access_token})
         set_refresh_cookies(response, refresh_token)
 
         return response
@@ -56,14 +60,11 @@ def register():
         password = request.form["password"]
         public_id = str(uuid.uuid4())
 
-        existing_user = User.get_user(email_id)
-        if existing_user:
-            return jsonify({"message": "User already exists. Please login."}), 400
-
-        hashed_password = generate_password_hash(password)
-        User.register_user(user_name, email_id, hashed_password, public_id)
+        hashed_password = hash_password(password)
+        if User.register_user(user_name, email_id, hashed_password, public_id) is None:
+            return ojsonify({"message": "User already exists. Please login."}, 400)
 
-        return jsonify({"status": "okay"}), 200
+        return ojsonify({"status": "okay"})
 
     return render_template("register.html")
 
@@ -72,19 +73,20 @@ def register():
 @jwt_required(refresh=True)
 def refresh():
     email_id = get_jwt_identity()
-    new_access = create_access_token(identity=email_id)
-    return {"access_token": new_access}
+    new_access = fast_create_access_token(email_id)
+    return ojsonify({"access_token": new_access})
 
 
 @auth_bp.post("/verify-token")
 @jwt_required()
 def verify():
-    return jsonify({"status": "okay"}), 200
+    return ojsonify({"status": "okay"})
 
 
 @auth_bp.post("/logout")
 @jwt_required()
 def logout():
-    response = jsonify({"msg": "logged out"})
+    invalidate_token(request.cookies.get("jwt_token"))
+    response = ojsonify({"msg": "logged out"})
     unset_jwt_cookies(response)
     return response
@@ -1,51 +1,79 @@
 from flask import (
     Blueprint,
+    current_app,
     request,
-    jsonify,
-    url_for,
-    render_template,
-    redirect,
 )
 from flask_jwt_extended import (
-    create_access_token,
-    create_refresh_token,
-    set_refresh_cookies,
     jwt_required,
     get_jwt_identity,
-    unset_jwt_cookies,
 )
 
-import uuid
-
-from webserver.db import user as User
 from webserver.db import storage as Storage
+from webserver.responses import ojsonify
 
 metadata_bp = Blueprint("metadata", __name__)
 
+# s3_metadata.file_size is a BIGINT
+MAX_FILE_SIZE = 2**63 - 1
+ROW_ERROR = "each row needs a string file_path and a non-negative integer size"
+
+
+def _valid_row(item) -> bool:
+    return (
+        isinstance(item, dict)
+        and isinstance(item.get("file_path"), str)
+        and isinstance(item.get("size"), int)
+        and not isinstance(item["size"], bool)
+        and 0 <= item["size"] <= MAX_FILE_SIZE
+    )
+
 
 @metadata_bp.post("/insert-metadata")
-@jwt_required
+@jwt_required()
 def insert_metadata():
-    data = request.json
+    data = request.get_json(silent=True)
     email_id = get_jwt_identity()
-    file_path = data["file_path"]
-    size = data["size"]
+    if not _valid_row(data):
+        return ojsonify({"error": ROW_ERROR}, 400)
+
     try:
-        Storage.insert_s3_metadata(email_id, file_path, size)
-    except Exception as err:
-        return jsonify({"error": err}), 500
+        Storage.insert_s3_metadata(email_id, data["file_path"], data["size"])
+    except Exception:
+        # the db error carries the statement and its params, keep it in the log
+        current_app.logger.exception("insert-metadata failed for %s", email_id)
+        return ojsonify({"error": "could not store metadata"}, 500)
+
+    return ojsonify({"status": "okay"})
 
-    return jsonify({"status": "okay"})
+
+@metadata_bp.post("/insert-metadata-batch")
+@jwt_required()
+def insert_metadata_batch():
+    email_id = get_jwt_identity()
+    items = request.get_json(silent=True)
+    max_rows = current_app.config["METADATA_BATCH_MAX_ROWS"]
+
+    if not isinstance(items, list):
+        return ojsonify({"error": "expected a list of {file_path, size} objects"}, 400)
+    if len(items) > max_rows:
+        return ojsonify({"error": f"at most {max_rows} rows per batch"}, 400)
+    if not all(_valid_row(item) for item in items):
+        return ojsonify({"error": ROW_ERROR}, 400)
+
+    rows = [(item["file_path"], item["size"]) for item in items]
+    try:
+        Storage.insert_s3_metadata_bulk(email_id, rows)
+    except Exception:
+        current_app.logger.exception("insert-metadata-batch failed for %s", email_id)
+        return ojsonify({"error": "could not store metadata"}, 500)
+
+    return ojsonify({"status": "okay", "inserted": len(rows)})
 
 
 @metadata_bp.post("/get-metadata")
-@jwt_required
+@jwt_required()
 def get_metadata():
     email_id = get_jwt_identity()
-    metadata = Storage.get_metadata_for_user(email_id)
-
-    total_file_size = 0
-    for row in metadata:
-        total_file_size += row["file_size"]
+    total_file_size = Storage.get_total_size_for_user(email_id)
 
-    return jsonify({"total_file_size": total_file_size}), 200
+    return ojsonify({"total_file_size": total_file_size})
@@ -0,0 +1,4 @@
+from webserver import create_app
+
+# gunicorn -c gunicorn.conf.py wsgi:application
+application = create_app()
\ No newline at end of file